@@ -2,6 +2,16 @@ import os
 import sys
 import subprocess
 import shutil
+import shlex
+import json
+import functools
+import time
+import threading
+import selectors
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
 from PyQt5 import QtCore, QtGui, QtWidgets
 
 # --- UTILS ---
@@ -11,6 +21,7 @@ def _app_base_dir():
         return os.path.dirname(sys.executable)
     return os.path.dirname(os.path.abspath(__file__))
 
+@functools.lru_cache(maxsize=1)
 def _find_ffmpeg_binary():
     base_dir = _app_base_dir()
     exe_name = "ffmpeg.exe" if os.name == "nt" else "ffmpeg"
@@ -22,6 +33,29 @@ def _find_ffmpeg_binary():
         return path_ffmpeg
     return None
 
+def _format_command(cmd):
+    # Copy-pasteable for the platform's shell, paths with spaces included
+    if os.name == "nt":
+        return subprocess.list2cmdline(cmd)
+    return shlex.join(cmd)
+
+@functools.lru_cache(maxsize=4)
+def _find_ffprobe_binary(ffmpeg_path):
+    # ffprobe ships alongside ffmpeg in every common build
+    exe_name = "ffprobe.exe" if os.name == "nt" else "ffprobe"
+    sibling = os.path.join(os.path.dirname(ffmpeg_path), exe_name)
+    if os.path.isfile(sibling):
+        return sibling
+    return shutil.which("ffprobe")
+
+def _resolve_ffprobe(ffmpeg_path):
+    ff = _find_ffprobe_binary(ffmpeg_path)
+    if ff and os.path.isfile(ff):
+        return ff
+    # Cached result is missing or stale (e.g. ffprobe installed since), scan again
+    _find_ffprobe_binary.cache_clear()
+    return _find_ffprobe_binary(ffmpeg_path)
+
 def _install_ffmpeg_windows(parent, installer_path):
     # This relies on an external batch file 'ffmpeginstall.bat'
     if parent is not None:
@@ -94,6 +128,11 @@ def _install_ffmpeg_macos(parent):
         return False
 
 def ensure_ffmpeg(parent=None):
+    ff = _find_ffmpeg_binary()
+    if ff and os.path.isfile(ff):
+        return ff
+    # Cached result is missing or stale, scan again
+    _find_ffmpeg_binary.cache_clear()
     ff = _find_ffmpeg_binary()
     if ff:
         return ff
@@ -105,6 +144,7 @@ def ensure_ffmpeg(parent=None):
         if os.path.isfile(installer):
             ok = _install_ffmpeg_windows(parent, installer)
             if ok:
+                _find_ffmpeg_binary.cache_clear()
                 ff = _find_ffmpeg_binary()
                 if ff:
                     return ff
@@ -124,6 +164,7 @@ def ensure_ffmpeg(parent=None):
     if sys.platform == "darwin":
         ok = _install_ffmpeg_macos(parent)
         if ok:
+            _find_ffmpeg_binary.cache_clear()
             ff = _find_ffmpeg_binary()
             if ff:
                 return ff
@@ -144,93 +185,515 @@ def ensure_ffmpeg(parent=None):
         )
     return None
 
+# --- ENCODING ---
+
+VIDEO_EXTS = frozenset({"mp4", "mkv", "webm", "mov", "avi"})
+AUDIO_EXTS = frozenset({"mp3", "wav", "flac", "m4a", "opus", "ogg", "wma"})
+MEDIA_FILTER = (
+    "Media Files ("
+    + " ".join(f"*.{e}" for e in sorted(VIDEO_EXTS | AUDIO_EXTS))
+    + ");;All Files (*.*)"
+)
+
+# Per-format encoder and quality settings, keyed by the FORMAT / QUALITY combo text.
+# "extra" holds encoder-specific knobs. libmp3lame is single-threaded and ignores -threads.
+CODEC_TABLE = {
+    "mp3": {
+        "codec": "libmp3lame",
+        "bitrate": {"High quality": "320k", "Balanced": "192k", "Smaller file": "128k"},
+    },
+    "opus": {
+        "codec": "libopus",
+        "bitrate": {"High quality": "160k", "Balanced": "128k", "Smaller file": "64k"},
+        "extra": {
+            "High quality": ["-vbr", "on", "-compression_level", "10"],
+            "Balanced": ["-compression_level", "5"],
+        },
+    },
+    "wav": {"codec": "pcm_s16le"},
+    "flac": {
+        "codec": "flac",
+        # Always lossless, this only trades encode CPU for file size
+        "extra": {
+            "High quality": ["-compression_level", "0"],
+            "Balanced": ["-compression_level", "5"],
+            "Smaller file": ["-compression_level", "8"],
+        },
+    },
+    "m4a": {
+        "codec": "aac",
+        "bitrate": {"High quality": "256k", "Balanced": "192k", "Smaller file": "192k"},
+    },
+    "aac": {
+        "codec": "aac",
+        "bitrate": {"High quality": "256k", "Balanced": "192k", "Smaller file": "192k"},
+    },
+    "ogg": {
+        "codec": "libvorbis",
+        "qscale": {"High quality": "6", "Balanced": "4", "Smaller file": "4"},
+    },
+    "wma": {
+        "codec": "wmav2",
+        "bitrate": {"High quality": "192k", "Balanced": "192k", "Smaller file": "192k"},
+    },
+}
+
+# Only the first audio stream is mapped, so ffmpeg never decodes video or subtitle
+# streams at all. An input without audio fails with a clear "matches no streams" error.
+AUDIO_ONLY_ARGS = ("-map", "0:a:0", "-vn", "-sn")
+
+# Codec ffprobe reports for a source that can be stream-copied straight into each format
+TARGET_TO_CODEC = {
+    "mp3": "mp3",
+    "m4a": "aac",
+    "aac": "aac",
+    "opus": "opus",
+    "flac": "flac",
+    "ogg": "vorbis",
+    "wav": "pcm_s16le",
+    "wma": "wmav2",
+}
+
+PROBE_TIMEOUT = 15  # seconds, ffprobe on a slow/network path shouldn't hang a job
+
+# (ffprobe_path, path, mtime) -> (codec_name, bit_rate or None), or None if unprobeable.
+# mtime is in the key so an edited file isn't served from the cache.
+_PROBE_CACHE = {}
+_PROBE_CACHE_MAX = 64
+
+def _probe_audio_stream(run_tracked, ffprobe_path, path, mtime):
+    # run_tracked is the job's cancellable runner: (cmd, timeout) -> (code, out, err) or None
+    key = (ffprobe_path, path, mtime)
+    if key in _PROBE_CACHE:
+        return _PROBE_CACHE[key]
+    result = run_tracked(
+        [
+            ffprobe_path, "-v", "error", "-select_streams", "a:0",
+            "-show_entries", "stream=codec_name,bit_rate", "-of", "default=nw=1", path,
+        ],
+        PROBE_TIMEOUT,
+    )
+    if result is None:
+        return None  # cancelled, timed out or couldn't start; don't cache
+    returncode, out, _ = result
+    probed = None
+    fields = dict(line.split("=", 1) for line in out.splitlines() if "=" in line)
+    if returncode == 0 and fields.get("codec_name"):
+        bit_rate = fields.get("bit_rate", "")
+        probed = fields["codec_name"], int(bit_rate) if bit_rate.isdigit() else None
+    if len(_PROBE_CACHE) >= _PROBE_CACHE_MAX:
+        _PROBE_CACHE.clear()
+    _PROBE_CACHE[key] = probed
+    return probed
+
+def _source_matches_target(ffprobe_path, in_path, ext, quality, run_tracked):
+    # True if in_path can be stream-copied into ext without ignoring the chosen QUALITY.
+    # Runs on the job's pool thread, never the GUI thread.
+    spec = CODEC_TABLE[ext]
+    if "qscale" in spec or spec.get("extra", {}).get(quality):
+        # VBR quality / encoder levels can't be compared against the source
+        return False
+    try:
+        mtime = os.path.getmtime(in_path)
+    except OSError:
+        return False  # let ffmpeg report the missing input
+    probed = _probe_audio_stream(run_tracked, ffprobe_path, in_path, mtime)
+    if probed is None or probed[0] != TARGET_TO_CODEC[ext]:
+        return False
+    if "bitrate" in spec:
+        # Only copy if the source is already at or below the requested bitrate
+        target = int(spec["bitrate"][quality].rstrip("k")) * 1000
+        return probed[1] is not None and probed[1] <= target
+    return True
+
+# Loudness normalization. dynaudnorm is cheap; single-pass loudnorm is very CPU-heavy,
+# so it's only used for "High quality", optionally as a measure-then-apply second pass.
+DYNAUDNORM_FILTER = "dynaudnorm=f=150:g=15"
+LOUDNORM_TARGET = "I=-16:TP=-1.5:LRA=11"
+LOUDNORM_FILTER = f"loudnorm={LOUDNORM_TARGET}"
+
+def _loudnorm_measure_command(ffmpeg_path, in_path):
+    return [
+        ffmpeg_path, "-hide_banner", "-nostats", "-i", in_path, *AUDIO_ONLY_ARGS,
+        "-af", f"{LOUDNORM_FILTER}:print_format=json", "-f", "null", "-",
+    ]
+
+def _loudnorm_from_measurement(output):
+    # loudnorm prints its JSON stats block last, after the regular ffmpeg output
+    start = output.rfind("{")
+    end = output.rfind("}")
+    if start == -1 or end < start:
+        return None
+    try:
+        stats = json.loads(output[start:end + 1])
+        return (
+            f"{LOUDNORM_FILTER}"
+            f":measured_I={stats['input_i']}"
+            f":measured_TP={stats['input_tp']}"
+            f":measured_LRA={stats['input_lra']}"
+            f":measured_thresh={stats['input_thresh']}"
+            f":offset={stats['target_offset']}"
+            ":linear=true"
+        )
+    except (ValueError, KeyError):
+        return None
+
 # --- WORKER ---
 
-class FfmpegWorker(QtCore.QObject):
+PIPE_BUFSIZE = 1024 * 1024
+READ_CHUNK = 65536
+LOG_FLUSH_INTERVAL = 0.1  # seconds
+LOG_FLUSH_BYTES = 8192
+F_SETPIPE_SZ = 1031  # Linux-only fcntl, not exposed by the fcntl module before 3.10
+
+def _grow_pipe(fileobj, size=PIPE_BUFSIZE):
+    # Widen the kernel pipe so ffmpeg output bursts don't stall the writer.
+    # Returns False if the kernel refused (e.g. capped by /proc/sys/fs/pipe-max-size).
+    if fcntl is None or not sys.platform.startswith("linux"):
+        return True
+    try:
+        fcntl.fcntl(fileobj.fileno(), F_SETPIPE_SZ, size)
+        return True
+    except OSError:
+        return False
+
+def _hidden_window_kwargs():
+    # Keep ffmpeg from flashing a console window on Windows
+    if os.name != "nt":
+        return {}
+    startupinfo = subprocess.STARTUPINFO()
+    startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+    return {"startupinfo": startupinfo, "creationflags": subprocess.CREATE_NO_WINDOW}
+
+def _read_chunks(stream):
+    # Yield raw output blocks until EOF. On POSIX this reads the fd directly with
+    # os.read behind a selector, and yields b"" on idle timeouts so the caller can
+    # flush on time. Windows can't select() on pipes, so it uses the buffered reader.
+    # This deliberately stays on the pool thread rather than a QSocketNotifier on the
+    # GUI loop: the pool threads are long-lived, and splitting/decoding here keeps that
+    # work off the GUI thread.
+    if os.name == "nt":
+        while chunk := stream.read1(READ_CHUNK):
+            yield chunk
+        return
+    fd = stream.fileno()
+    os.set_blocking(fd, False)
+    with selectors.DefaultSelector() as sel:
+        sel.register(fd, selectors.EVENT_READ)
+        while True:
+            if not sel.select(LOG_FLUSH_INTERVAL):
+                yield b""
+                continue
+            try:
+                chunk = os.read(fd, READ_CHUNK)
+            except BlockingIOError:
+                continue
+            if not chunk:
+                return
+            yield chunk
+
+def _file_stamp(path):
+    # (mtime_ns, size) of path, or None if it doesn't exist
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+class FfmpegJobSignals(QtCore.QObject):
+    # QRunnable isn't a QObject, so its signals live here
     log_signal = QtCore.pyqtSignal(str)
+    progress_signal = QtCore.pyqtSignal(str)
     finished = QtCore.pyqtSignal(bool)
 
-    def __init__(self, command, workdir):
+class FfmpegJob(QtCore.QRunnable):
+    def __init__(self, command, workdir, measure_command=None, log_prefix="",
+                 copy_command=None, copy_check=None, echo_commands=True):
         super().__init__()
+        self.signals = FfmpegJobSignals()
+        self.log_signal = self.signals.log_signal
+        self.progress_signal = self.signals.progress_signal
+        self.finished = self.signals.finished
         self.command = command
         self.workdir = workdir
+        # Optional loudnorm analysis pass; its result replaces the -af value in command
+        self.measure_command = measure_command
+        # Optional remux-only command, used instead of command if copy_check(run_tracked) says so
+        self.copy_command = copy_command
+        self.copy_check = copy_check
+        self.echo_commands = echo_commands
+        # Tags every output line (e.g. with the file name when several jobs share the log).
+        # Encoded once here so the read loop can prefix whole batches in bytes.
+        self.log_prefix = log_prefix
+        self._line_prefix = log_prefix.encode("utf-8")
+        self._newline_prefix = b"\n" + self._line_prefix
+        # cancel() is called from the GUI thread while run() is on a pool thread
+        self._process = None
+        self._cancelled = False
+        self._lock = threading.Lock()
 
-    @QtCore.pyqtSlot()
-    def run(self):
-        try:
-            startupinfo = None
-            creationflags = 0
+    def _log(self, text):
+        self.log_signal.emit(self.log_prefix + text)
+
+    def _decode_lines(self, lines):
+        # A line that was overwritten in place with "\r" only keeps its final text.
+        # rstrip also turns "\r\n" endings into plain lines.
+        if b"\r" in lines:
+            lines = b"\n".join(line.rstrip(b"\r").rsplit(b"\r", 1)[-1] for line in lines.split(b"\n"))
+        if self._line_prefix:
+            lines = self._line_prefix + lines.replace(b"\n", self._newline_prefix)
+        return lines.decode("utf-8", "replace") + "\n"
+
+    def cancel(self):
+        with self._lock:
+            self._cancelled = True
+            process = self._process
+        if process is not None and process.poll() is None:
+            process.terminate()
 
-            if os.name == "nt":
-                startupinfo = subprocess.STARTUPINFO()
-                startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-                creationflags = subprocess.CREATE_NO_WINDOW
+    def _track(self, process):
+        # Returns False (and stops the process) if cancel() already ran
+        with self._lock:
+            self._process = process
+            cancelled = self._cancelled
+        if cancelled:
+            process.terminate()
+        return not cancelled
 
+    def _run_tracked(self, cmd, timeout=None):
+        # Run a helper process to completion where cancel() can stop it.
+        # Returns (returncode, stdout, stderr), or None if cancelled, timed out or unstartable.
+        try:
             process = subprocess.Popen(
-                self.command,
+                cmd,
                 cwd=self.workdir,
                 stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                universal_newlines=True,
+                stderr=subprocess.PIPE,
                 text=True,
                 encoding="utf-8",
                 errors="replace",
-                startupinfo=startupinfo,
-                creationflags=creationflags,
+                **_hidden_window_kwargs(),
+            )
+        except OSError:
+            return None
+        if not self._track(process):
+            process.communicate()
+            return None
+        try:
+            out, err = process.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.communicate()
+            return None
+        if self._cancelled:
+            return None
+        return process.returncode, out, err
+
+    def _measure_loudnorm(self):
+        self._log("Measuring loudness (pass 1 of 2)...\n")
+        if self.echo_commands:
+            self._log(f"CMD: {_format_command(self.measure_command)}\n")
+        result = self._run_tracked(self.measure_command)
+        if result is None or result[0] != 0:
+            return None
+        return _loudnorm_from_measurement(result[2])
+
+    def run(self):
+        if self._cancelled:
+            self.finished.emit(False)
+            return
+
+        if self.measure_command:
+            measured = self._measure_loudnorm()
+            if self._cancelled:
+                self.finished.emit(False)
+                return
+            if measured:
+                self.command[self.command.index("-af") + 1] = measured
+            else:
+                self._log("WARNING: loudness measurement failed, using single-pass loudnorm.\n")
+
+        if self.copy_command and self.copy_check(self._run_tracked):
+            self._log("Source audio already matches the target, copying stream without re-encoding.\n")
+            self.command = self.copy_command
+        if self._cancelled:
+            self.finished.emit(False)
+            return
+
+        # Logged only now, after the measured loudnorm values (or copy) are substituted,
+        # so it's the command that actually runs
+        if self.echo_commands:
+            self._log(f"CMD: {_format_command(self.command)}\n")
+
+        # Snapshot the output so a cancel only deletes it if this run actually wrote it
+        out_path = self.command[-1]
+        out_before = _file_stamp(out_path)
+        try:
+            process = subprocess.Popen(
+                self.command,
+                cwd=self.workdir,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                bufsize=0 if os.name != "nt" else PIPE_BUFSIZE,
+                **_hidden_window_kwargs(),
             )
         except FileNotFoundError:
-            self.log_signal.emit("ERROR: ffmpeg execution failed. Check installation.\n")
+            self._log("ERROR: ffmpeg execution failed. Check installation.\n")
+            self.finished.emit(False)
+            return
+        except OSError as exc:
+            # e.g. EMFILE/ENOMEM; still report back so the batch counter reaches zero
+            self._log(f"ERROR: could not start ffmpeg: {exc}\n")
             self.finished.emit(False)
             return
+        if not self._track(process):
+            # Cancelled before we got here; ffmpeg never got a chance to write anything
+            process.wait()
+            process.stdout.close()
+            self.finished.emit(False)
+            return
+
+        if not _grow_pipe(process.stdout):
+            self._log(
+                "WARNING: could not enlarge output pipe (check /proc/sys/fs/pipe-max-size).\n"
+            )
 
-        for line in process.stdout:
-            self.log_signal.emit(line)
+        # Read big binary blocks and decode whole lines in bulk.
+        # Decoded text is held back and emitted at most every LOG_FLUSH_INTERVAL
+        # (or once LOG_FLUSH_BYTES pile up) so the GUI thread gets few, large updates.
+        # ffmpeg redraws its "size=... time=..." status with "\r"; those updates never
+        # reach the log, only the newest one goes out on progress_signal per flush.
+        pending = b""
+        buf = []
+        buf_len = 0
+        progress = None
+        last_flush = time.monotonic()
+        # On Windows a trailing "\r" may be the first half of "\r\n", so wait for the next byte
+        cr_end = -1 if os.name == "nt" else None
+        for chunk in _read_chunks(process.stdout):
+            pending += chunk
+            cut = max(pending.rfind(b"\n"), pending.rfind(b"\r", 0, cr_end))
+            if cut != -1:
+                done, pending = pending[:cut + 1], pending[cut + 1:]
+                nl = done.rfind(b"\n")
+                if nl != -1:
+                    text = self._decode_lines(done[:nl])
+                    buf.append(text)
+                    buf_len += len(text)
+                if nl + 1 < len(done):
+                    progress = done[nl + 1:].rstrip(b"\r").rsplit(b"\r", 1)[-1]
+            now = time.monotonic()
+            if (buf or progress is not None) and (
+                buf_len > LOG_FLUSH_BYTES or now - last_flush >= LOG_FLUSH_INTERVAL
+            ):
+                if buf:
+                    self.log_signal.emit("".join(buf))
+                    buf.clear()
+                    buf_len = 0
+                if progress is not None:
+                    self.progress_signal.emit(
+                        (self._line_prefix + progress).decode("utf-8", "replace").strip()
+                    )
+                    progress = None
+                last_flush = now
+        if pending.rstrip(b"\r"):
+            buf.append(self._decode_lines(pending))
+        if buf:
+            self.log_signal.emit("".join(buf))
 
+        # Finished jobs stay referenced until the batch ends, so release the pipe fd now
+        process.stdout.close()
         process.wait()
+        out_after = _file_stamp(out_path)
+        if self._cancelled and process.returncode != 0 and out_after not in (None, out_before):
+            # -y wrote straight to the final name, don't leave a truncated file that looks done
+            try:
+                os.remove(out_path)
+                self._log(f"Removed incomplete output: {out_path}\n")
+            except FileNotFoundError:
+                pass
+            except OSError:
+                self._log(f"WARNING: incomplete output left behind: {out_path}\n")
         self.finished.emit(process.returncode == 0)
 
 # --- GUI COMPONENTS ---
 
+LOG_MAX_BLOCKS = 2000
+# Each ffmpeg can use several cores itself, so only run half as many jobs as cores
+MAX_PARALLEL_JOBS = max(1, (os.cpu_count() or 2) // 2)
+
+_MAIN_QSS = """
+    QMainWindow { background-color: #050712; }
+    #leftPanel { background-color: #0c1024; border-radius: 10px; }
+    #rightPanel { background-color: #070a18; border-radius: 10px; }
+    #titleLabel { color: #00f5ff; font-size: 20px; font-weight: 800; letter-spacing: 2px; }
+    #bigLabel { color: #ff00ff; font-size: 26px; font-weight: 900; }
+    #subLabel { color: #a9b3df; font-size: 12px; }
+    #miniLabel { color: #c2c8f0; font-size: 11px; letter-spacing: 1px; }
+    #progressLabel { color: #00f5ff; font-family: Consolas, monospace; font-size: 11px; }
+    QLineEdit { background-color: #050714; border: 1px solid #24294a; border-radius: 6px; color: #ffffff; padding: 4px 6px; }
+    QComboBox { background-color: #050714; border: 1px solid #24294a; border-radius: 6px; color: #ffffff; padding: 2px 4px; }
+    QComboBox QAbstractItemView { background-color: #050714; color: #ffffff; selection-background-color: #00f5ff; }
+    QCheckBox { color: #b8c0e0; font-size: 12px; }
+    QCheckBox::indicator { width: 16px; height: 16px; }
+    QCheckBox::indicator:unchecked { border: 1px solid #00f5ff; background-color: #050712; }
+    QCheckBox::indicator:checked { border: 1px solid #00f5ff; background-color: #00f5ff; }
+    QPlainTextEdit#logView { background-color: #050714; border: 1px solid #24294a; border-radius: 6px; color: #e3e7ff; font-family: Consolas, monospace; font-size: 11px; }
+    QScrollBar:vertical { background: #050712; width: 10px; margin: 0px; }
+    QScrollBar::handle:vertical { background: #2b2f4a; min-height: 20px; border-radius: 4px; }
+    QPushButton[class="retro"] {
+        color: #0ff;
+        background-color: rgba(10, 10, 25, 0.9);
+        border: 2px solid #0ff;
+        border-radius: 8px;
+        font-size: 13px;
+        font-weight: 600;
+        padding: 4px 10px;
+    }
+    QPushButton[class="retro"]:hover {
+        background-color: rgba(0, 255, 255, 0.18);
+        border-color: #6ff;
+    }
+    QPushButton[class="retro"]:pressed {
+        background-color: #044;
+        border-color: #0aa;
+    }
+    QPushButton[class="retro"]:disabled {
+        color: #555;
+        border-color: #333;
+        background-color: rgba(8, 8, 18, 0.7);
+    }
+"""
+
 class RetroButton(QtWidgets.QPushButton):
     def __init__(self, text, parent=None):
         super().__init__(text, parent)
         self.setCursor(QtGui.QCursor(QtCore.Qt.PointingHandCursor))
         self.setMinimumHeight(36)
-        self.setStyleSheet("""
-            QPushButton {
-                color: #0ff;
-                background-color: rgba(10, 10, 25, 0.9);
-                border: 2px solid #0ff;
-                border-radius: 8px;
-                font-size: 13px;
-                font-weight: 600;
-                padding: 4px 10px;
-            }
-            QPushButton:hover {
-                background-color: rgba(0, 255, 255, 0.18);
-                border-color: #6ff;
-            }
-            QPushButton:pressed {
-                background-color: #044;
-                border-color: #0aa;
-            }
-            QPushButton:disabled {
-                color: #555;
-                border-color: #333;
-                background-color: rgba(8, 8, 18, 0.7);
-            }
-        """)
+        # Styled by the QPushButton[class="retro"] rules in _MAIN_QSS, so the sheet is
+        # parsed once for the window instead of once per button
+        self.setProperty("class", "retro")
 
 class RetroWindow(QtWidgets.QMainWindow):
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Gehans Audio Converter")
         self.setMinimumSize(960, 560)
-        self.input_path = ""
+        self.input_paths = []
         self.output_dir = os.path.expanduser("~")
+        self._ffmpeg_path = None
+        self.settings = QtCore.QSettings("Gehans", "Gehans Audio Converter")
         self._setup_ui()
         self._apply_style()
-        self.worker_thread = None
+        # One pool for the app lifetime; its threads never expire, so batches
+        # after the first don't pay for thread startup again
+        self.pool = QtCore.QThreadPool(self)
+        self.pool.setMaxThreadCount(MAX_PARALLEL_JOBS)
+        self.pool.setExpiryTimeout(-1)
+        self._jobs = []
+        self._jobs_left = 0
+        self._jobs_failed = 0
+        self._cancel_requested = False
 
     def _setup_ui(self):
         central = QtWidgets.QWidget()
@@ -298,7 +761,7 @@ class RetroWindow(QtWidgets.QMainWindow):
         fmt_label = QtWidgets.QLabel("FORMAT")
         fmt_label.setObjectName("miniLabel")
         self.format_combo = QtWidgets.QComboBox()
-        self.format_combo.addItems(["mp3", "opus", "wav", "flac", "m4a", "aac", "ogg", "wma"])
+        self.format_combo.addItems(list(CODEC_TABLE))
         self.format_combo.setCurrentText("mp3")
 
         vibe_label = QtWidgets.QLabel("QUALITY")
@@ -316,10 +779,13 @@ class RetroWindow(QtWidgets.QMainWindow):
         # Options
         self.normalize_box = QtWidgets.QCheckBox("Normalize loudness")
         self.normalize_box.setChecked(True)
-        self.strip_subs_box = QtWidgets.QCheckBox("Strip subtitles (if they exist)")
-        self.strip_subs_box.setChecked(False)
+        self.two_pass_box = QtWidgets.QCheckBox("Two-pass loudnorm (High quality only, slower)")
+        self.two_pass_box.setChecked(False)
         left_layout.addWidget(self.normalize_box)
-        left_layout.addWidget(self.strip_subs_box)
+        left_layout.addWidget(self.two_pass_box)
+        self.echo_cmd_box = QtWidgets.QCheckBox("Show ffmpeg commands in log")
+        self.echo_cmd_box.setChecked(True)
+        left_layout.addWidget(self.echo_cmd_box)
 
         left_layout.addStretch(1)
 
@@ -328,7 +794,7 @@ class RetroWindow(QtWidgets.QMainWindow):
         self.convert_button = RetroButton("CONVERT")
         self.convert_button.clicked.connect(self.start_convert)
         self.cancel_button = RetroButton("CANCEL")
-        self.cancel_button.setEnabled(True)
+        self.cancel_button.setEnabled(False)
         self.cancel_button.clicked.connect(self.cancel_convert)
         btn_row.addStretch(1)
         btn_row.addWidget(self.convert_button)
@@ -342,43 +808,48 @@ class RetroWindow(QtWidgets.QMainWindow):
         right_layout.setContentsMargins(14, 14, 14, 14)
         right_layout.setSpacing(8)
 
+        log_header = QtWidgets.QHBoxLayout()
         log_title = QtWidgets.QLabel("LOG")
         log_title.setObjectName("miniLabel")
-        right_layout.addWidget(log_title)
+        # Live ffmpeg status line, kept out of the log itself
+        self.progress_label = QtWidgets.QLabel("")
+        self.progress_label.setObjectName("progressLabel")
+        self.progress_label.setAlignment(QtCore.Qt.AlignRight | QtCore.Qt.AlignVCenter)
+        # Takes whatever width is left instead of growing the panel to fit the text
+        self.progress_label.setSizePolicy(
+            QtWidgets.QSizePolicy.Ignored, QtWidgets.QSizePolicy.Preferred
+        )
+        log_header.addWidget(log_title)
+        log_header.addWidget(self.progress_label, 1)
+        right_layout.addLayout(log_header)
         self.log_view = QtWidgets.QPlainTextEdit()
         self.log_view.setReadOnly(True)
         self.log_view.setObjectName("logView")
+        # Old lines get evicted once the log hits this size, so it never grows unbounded
+        self.log_view.setMaximumBlockCount(LOG_MAX_BLOCKS)
         right_layout.addWidget(self.log_view, 1)
 
         main_layout.addWidget(left_panel, 3)
         main_layout.addWidget(right_panel, 4)
 
     def _apply_style(self):
-        self.setStyleSheet("""
-            QMainWindow { background-color: #050712; }
-            #leftPanel { background-color: #0c1024; border-radius: 10px; }
-            #rightPanel { background-color: #070a18; border-radius: 10px; }
-            #titleLabel { color: #00f5ff; font-size: 20px; font-weight: 800; letter-spacing: 2px; }
-            #bigLabel { color: #ff00ff; font-size: 26px; font-weight: 900; }
-            #subLabel { color: #a9b3df; font-size: 12px; }
-            #miniLabel { color: #c2c8f0; font-size: 11px; letter-spacing: 1px; }
-            QLineEdit { background-color: #050714; border: 1px solid #24294a; border-radius: 6px; color: #ffffff; padding: 4px 6px; }
-            QComboBox { background-color: #050714; border: 1px solid #24294a; border-radius: 6px; color: #ffffff; padding: 2px 4px; }
-            QComboBox QAbstractItemView { background-color: #050714; color: #ffffff; selection-background-color: #00f5ff; }
-            QCheckBox { color: #b8c0e0; font-size: 12px; }
-            QCheckBox::indicator { width: 16px; height: 16px; }
-            QCheckBox::indicator:unchecked { border: 1px solid #00f5ff; background-color: #050712; }
-            QCheckBox::indicator:checked { border: 1px solid #00f5ff; background-color: #00f5ff; }
-            QPlainTextEdit#logView { background-color: #050714; border: 1px solid #24294a; border-radius: 6px; color: #e3e7ff; font-family: Consolas, monospace; font-size: 11px; }
-            QScrollBar:vertical { background: #050712; width: 10px; margin: 0px; }
-            QScrollBar::handle:vertical { background: #2b2f4a; min-height: 20px; border-radius: 4px; }
-        """)
+        self.setStyleSheet(_MAIN_QSS)
 
     def append_log(self, text):
-        self.log_view.appendPlainText(text)
-        self.log_view.verticalScrollBar().setValue(
-            self.log_view.verticalScrollBar().maximum()
+        # Text arrives already newline-terminated and batched by the worker,
+        # so the scrollbar only moves once per flush
+        self.log_view.moveCursor(QtGui.QTextCursor.End)
+        self.log_view.insertPlainText(text)
+        bar = self.log_view.verticalScrollBar()
+        bar.setValue(bar.maximum())
+
+    def set_progress(self, text):
+        # The status line is long (plus a file name in batches), so cut it to the label
+        metrics = self.progress_label.fontMetrics()
+        self.progress_label.setText(
+            metrics.elidedText(text, QtCore.Qt.ElideRight, self.progress_label.width())
         )
+        self.progress_label.setToolTip(text)
 
     def set_busy(self, busy: bool):
         self.convert_button.setEnabled(not busy)
@@ -388,25 +859,42 @@ class RetroWindow(QtWidgets.QMainWindow):
         else:
             self.sub_label.setText("Pick a file. Pick a format. Convert it with ffmpeg.")
 
+    def _dialog_options(self):
+        # Stay on the native dialog; on Linux also skip per-folder custom icon lookups
+        opts = QtWidgets.QFileDialog.Options()
+        if sys.platform.startswith("linux"):
+            opts |= QtWidgets.QFileDialog.DontUseCustomDirectoryIcons
+        return opts
+
     def pick_file(self):
-        path, _ = QtWidgets.QFileDialog.getOpenFileName(
-            self, "Select Input Media", "",
-            "Media Files (*.mp4 *.mkv *.webm *.mp3 *.wav *.flac *.mov *.avi *.m4a *.opus *.ogg *.wma);;All Files (*.*)"
+        # Open where the user last picked from instead of the CWD
+        start_dir = self.settings.value("last_input_dir", self.output_dir, type=str)
+        paths, _ = QtWidgets.QFileDialog.getOpenFileNames(
+            self, "Select Input Media", start_dir,
+            MEDIA_FILTER,
+            options=self._dialog_options(),
         )
-        if path:
-            self.input_path = path
-            self.file_display.setText(path)
-            self.append_log(f"INPUT: {path}\n")
+        if paths:
+            self.settings.setValue("last_input_dir", os.path.dirname(paths[0]))
+            self.input_paths = paths
+            if len(paths) == 1:
+                self.file_display.setText(paths[0])
+            else:
+                self.file_display.setText(f"{len(paths)} files selected")
+            self.append_log("".join(f"INPUT: {path}\n" for path in paths))
 
     def pick_output_folder(self):
-        folder = QtWidgets.QFileDialog.getExistingDirectory(self, "Select Output Folder", self.output_dir)
+        folder = QtWidgets.QFileDialog.getExistingDirectory(
+            self, "Select Output Folder", self.output_dir,
+            options=QtWidgets.QFileDialog.ShowDirsOnly | self._dialog_options(),
+        )
         if folder:
             self.output_dir = folder
             self.output_display.setText(folder)
             self.append_log(f"OUTPUT DIR: {folder}\n")
 
     def start_convert(self):
-        if not self.input_path:
+        if not self.input_paths:
             QtWidgets.QMessageBox.warning(self, "No input", "Pick a file first.")
             return
 
@@ -414,106 +902,158 @@ class RetroWindow(QtWidgets.QMainWindow):
             QtWidgets.QMessageBox.warning(self, "Invalid output", "Output folder does not exist.")
             return
 
-        ffmpeg_path = ensure_ffmpeg(self)
-        if not ffmpeg_path:
-            return
+        ffmpeg_path = self._ffmpeg_path
+        if not (ffmpeg_path and os.path.isfile(ffmpeg_path)):
+            ffmpeg_path = ensure_ffmpeg(self)
+            if not ffmpeg_path:
+                return
+            self._ffmpeg_path = ffmpeg_path
 
-        in_path = self.input_path
-        base_name = os.path.splitext(os.path.basename(in_path))[0]
         ext = self.format_combo.currentText()
-        out_path = os.path.join(self.output_dir, f"{base_name}.{ext}")
         quality = self.quality_combo.currentText()
 
-        # Build FFmpeg Command
-        cmd = [ffmpeg_path, "-y", "-i", in_path]
-
-        # Audio Codec Logic
-        # -vn removes video stream (ensures we get audio file)
-        cmd.append("-vn")
+        self.append_log("=== Starting conversion ===\n")
+        self.set_busy(True)
+        self._jobs = []
+        self._jobs_left = len(self.input_paths)
+        self._jobs_failed = 0
+        self._cancel_requested = False
+        batch = len(self.input_paths) > 1
+        out_paths = self._output_paths(ext)
+        for in_path, out_path in zip(self.input_paths, out_paths):
+            cmd, measure_cmd, copy_cmd, copy_check = self._build_command(
+                ffmpeg_path, in_path, out_path, ext, quality
+            )
+            # Parallel jobs share the log, so tag their lines with the file name
+            prefix = f"[{os.path.basename(in_path)}] " if batch else ""
+            job = FfmpegJob(
+                cmd, self.output_dir, measure_cmd, prefix,
+                copy_cmd, copy_check, self.echo_cmd_box.isChecked(),
+            )
+            # Keep the Python wrapper alive until the batch is done
+            job.setAutoDelete(False)
+            job.log_signal.connect(self.append_log)
+            job.progress_signal.connect(self.set_progress)
+            job.finished.connect(self.on_convert_finished)
+            self._jobs.append(job)
+            self.pool.start(job)
 
-        if ext == "mp3":
-            cmd += ["-c:a", "libmp3lame"]
-            if quality == "High quality":
-                cmd += ["-b:a", "320k"]
-            elif quality == "Smaller file":
-                cmd += ["-b:a", "128k"]
-            else:
-                cmd += ["-b:a", "192k"]
+    def _output_paths(self, ext):
+        # Inputs sharing a base name (song.flac + song.wav) would make parallel jobs
+        # write the same file, so later ones get "song (2).mp3" and so on
+        paths = []
+        taken = set()
+        for in_path in self.input_paths:
+            base_name = os.path.splitext(os.path.basename(in_path))[0]
+            out_path = os.path.join(self.output_dir, f"{base_name}.{ext}")
+            n = 2
+            while os.path.normcase(out_path) in taken:
+                out_path = os.path.join(self.output_dir, f"{base_name} ({n}).{ext}")
+                n += 1
+            if n > 2:
+                self.append_log(f"OUTPUT RENAMED: {in_path} -> {out_path}\n")
+            taken.add(os.path.normcase(out_path))
+            paths.append(out_path)
+        return paths
 
-        elif ext == "opus":
-            cmd += ["-c:a", "libopus"]
-            if quality == "High quality":
-                 cmd += ["-b:a", "160k"]
-            elif quality == "Smaller file":
-                 cmd += ["-b:a", "64k"]
-            else:
-                 cmd += ["-b:a", "128k"]
+    def _build_command(self, ffmpeg_path, in_path, out_path, ext, quality):
+        # Build FFmpeg Command
+        head = [ffmpeg_path, "-y", "-i", in_path]
 
-        elif ext == "wav":
-            cmd += ["-c:a", "pcm_s16le"]
+        # Audio Codec Logic
+        # Map just the audio (ensures we get an audio file without touching the video)
+        head += AUDIO_ONLY_ARGS
 
-        elif ext == "flac":
-            cmd += ["-c:a", "flac"]
+        # Let multi-threaded encoders pick a thread count for this machine
+        encode = ["-threads", "0"]
+        spec = CODEC_TABLE[ext]
+        encode += ["-c:a", spec["codec"]]
+        if "bitrate" in spec:
+            encode += ["-b:a", spec["bitrate"][quality]]
+        elif "qscale" in spec:
+            encode += ["-q:a", spec["qscale"][quality]]
+        encode += spec.get("extra", {}).get(quality, [])
 
-        elif ext in ["m4a", "aac"]:
-            cmd += ["-c:a", "aac"]
-            if quality == "High quality":
-                cmd += ["-b:a", "256k"]
-            else:
-                cmd += ["-b:a", "192k"]
+        tail = []
+        if ext == "m4a":
+            # Put the index up front so players can start before reading the whole file
+            tail += ["-movflags", "+faststart"]
 
-        elif ext == "ogg":
-            cmd += ["-c:a", "libvorbis"]
-            if quality == "High quality":
-                 cmd += ["-q:a", "6"]
-            else:
-                 cmd += ["-q:a", "4"]
+        # If the source already has the target codec (at no more than the chosen quality)
+        # the job can just remux. The ffprobe check runs in the job, off the GUI thread.
+        copy_cmd = None
+        copy_check = None
+        in_ext = os.path.splitext(in_path)[1].lstrip(".").lower()
+        must_encode = self.normalize_box.isChecked()
+        # A plain audio file of another format can't match, so don't bother running ffprobe
+        known_mismatch = in_ext in AUDIO_EXTS and TARGET_TO_CODEC[in_ext] != TARGET_TO_CODEC[ext]
+        ffprobe_path = None if must_encode or known_mismatch else _resolve_ffprobe(ffmpeg_path)
+        if ffprobe_path:
+            copy_cmd = head + ["-c:a", "copy"] + tail + [out_path]
+            copy_check = functools.partial(_source_matches_target, ffprobe_path, in_path, ext, quality)
 
-        elif ext == "wma":
-            cmd += ["-c:a", "wmav2", "-b:a", "192k"]
+        cmd = head + encode + tail
 
         # Filters
+        measure_cmd = None
         if self.normalize_box.isChecked():
-            cmd += ["-af", "loudnorm"]
-        
-        # Note: -sn strips subtitles, but usually -vn implicitly handles that for audio formats
-        if self.strip_subs_box.isChecked():
-            cmd += ["-sn"]
+            if quality == "High quality":
+                cmd += ["-af", LOUDNORM_FILTER]
+                if self.two_pass_box.isChecked():
+                    measure_cmd = _loudnorm_measure_command(ffmpeg_path, in_path)
+            else:
+                cmd += ["-af", DYNAUDNORM_FILTER]
 
         cmd.append(out_path)
-
-        self.append_log("=== Starting conversion ===\n")
-        self.append_log(f"CMD: {' '.join(cmd)}\n")
-        
-        self.set_busy(True)
-        self.worker_thread = QtCore.QThread()
-        self.worker = FfmpegWorker(cmd, self.output_dir)
-        self.worker.moveToThread(self.worker_thread)
-        self.worker_thread.started.connect(self.worker.run)
-        self.worker.log_signal.connect(self.append_log)
-        self.worker.finished.connect(self.on_convert_finished)
-        self.worker.finished.connect(self.worker_thread.quit)
-        self.worker.finished.connect(self.worker.deleteLater)
-        self.worker_thread.finished.connect(self.worker_thread.deleteLater)
-        self.worker_thread.start()
+        return cmd, measure_cmd, copy_cmd, copy_check
 
     def cancel_convert(self):
-        QtWidgets.QMessageBox.information(
-            self, "Cancel", "To cancel, close the application window."
-        )
+        if not self._jobs:
+            return
+        self._cancel_requested = True
+        self.cancel_button.setEnabled(False)
+        self.append_log("\n=== Cancelling... ===\n")
+        for job in list(self._jobs):
+            if self.pool.tryTake(job):
+                # Never started, so it won't report back on its own
+                self.on_convert_finished(False)
+            else:
+                job.cancel()
+
+    def closeEvent(self, event):
+        # Don't leave ffmpeg running (or pool threads blocked on it) after the window goes
+        self.pool.clear()
+        for job in self._jobs:
+            job.cancel()
+        self.pool.waitForDone()
+        super().closeEvent(event)
 
     def on_convert_finished(self, ok: bool):
-        self.set_busy(False)
+        # Runs on the GUI thread once per job, so the counters need no locking
+        self._jobs_left -= 1
         if ok:
-            self.append_log("\n=== Conversion finished successfully ===\n")
-            self.sub_label.setText("File converted. You’re one step closer to audio supremacy.")
             try:
                 current = int(self.big_label.text())
                 self.big_label.setText(str(current + 1))
             except ValueError:
                 self.big_label.setText("1")
         else:
-            self.append_log("\n=== Conversion NOT WORKING BHAI ===\n")
+            self._jobs_failed += 1
+        if self._jobs_left > 0:
+            return
+
+        self._jobs = []
+        self.set_busy(False)
+        self.progress_label.clear()
+        self.progress_label.setToolTip("")
+        if self._cancel_requested:
+            self.append_log("\n=== Conversion cancelled ===\n")
+            self.sub_label.setText("Conversion cancelled.")
+        elif not self._jobs_failed:
+            self.append_log("\n=== Conversion finished successfully ===\n")
+            self.sub_label.setText("File converted. You’re one step closer to audio supremacy.")
+        else:
+            self.append_log(f"\n=== Conversion NOT WORKING BHAI ({self._jobs_failed} failed) ===\n")
             self.sub_label.setText("Conversion NOT WORKING BHAI. Check the log for details.")
 
 def main():